@@ -10,28 +10,45 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.chess_env import ChessEnvironment
 from src.minimax import MinimaxAgent
 from src.alphabeta import AlphaBetaAgent
-from src.visualizer import ChessVisualizer
+from src.visualizer import ChessVisualizer, AsyncVisualizer
+from src.evaluation import load_weights
+from src.time_manager import TimeManager
 
-def generate_game_video(algorithm="alphabeta", depth=3, max_moves=50, display=True):
-    """Generate a video of the AI playing chess against itself"""
+def generate_game_video(algorithm="alphabeta", depth=3, max_moves=50, display=True,
+                        clock=None, increment=0.0, moves_to_go=None, weights=None):
+    """
+    Generate a video of the AI playing chess against itself.
+
+    When clock is given each side gets that many seconds for the game and
+    depth becomes the maximum depth of an iteratively deepened search.
+    weights is an optional file of tuned evaluation weights.
+    """
+
+    if weights:
+        load_weights(weights)
 
     env = ChessEnvironment()
     board = env.reset()
 
+    white_clock = TimeManager(clock, increment, moves_to_go) if clock else None
+    black_clock = TimeManager(clock, increment, moves_to_go) if clock else None
+
     if algorithm.lower() == "minimax":
-        white_agent = MinimaxAgent(depth=depth)
-        black_agent = MinimaxAgent(depth=depth)
+        white_agent = MinimaxAgent(depth=depth, time_manager=white_clock)
+        black_agent = MinimaxAgent(depth=depth, time_manager=black_clock)
         algo_name = "Minimax"
     else:
-        white_agent = AlphaBetaAgent(depth=depth)
-        black_agent = AlphaBetaAgent(depth=depth)
+        white_agent = AlphaBetaAgent(depth=depth, time_manager=white_clock)
+        black_agent = AlphaBetaAgent(depth=depth, time_manager=black_clock)
         algo_name = "Alpha-Beta"
 
     visualizer = ChessVisualizer()
+    window = AsyncVisualizer() if display else None
 
     move_count = 0
     last_move = None
     game_over = False
+    flagged = None
 
     print(f"Starting chess game with {algo_name} algorithm (depth={depth})")
 
@@ -47,6 +64,12 @@ def generate_game_video(algorithm="alphabeta", depth=3, max_moves=50, display=Tr
 
         print(f"Move chosen: {move} in {end_time - start_time:.2f} seconds")
 
+        if current_agent.time_manager is not None:
+            print(f"Clock: {current_agent.time_manager.remaining:.2f} seconds left")
+            if current_agent.time_manager.flagged():
+                flagged = "White" if board.turn == chess.WHITE else "Black"
+                break
+
         if move is None:
             print("No legal moves available")
             game_over = True
@@ -58,12 +81,13 @@ def generate_game_video(algorithm="alphabeta", depth=3, max_moves=50, display=Tr
 
         visualizer.capture_frame(board, last_move)
 
-        if display:
-            if not visualizer.show(board, last_move):
-                break  
-            time.sleep(0.5)  
+        if window is not None and not window.show(board, last_move):
+            print("Display window closed, stopping game")
+            break
 
-    if game_over:
+    if flagged:
+        print(f"\n{flagged} ran out of time!")
+    elif game_over:
         result = board.result()
         print(f"\nGame over! Result: {result}")
         if result == "1-0":
@@ -78,6 +102,8 @@ def generate_game_video(algorithm="alphabeta", depth=3, max_moves=50, display=Tr
     video_name = f"{algo_name.lower()}_depth{depth}_game.mp4"
     visualizer.save_video(video_name)
 
+    if window is not None:
+        window.close()
     pygame.quit()
     return video_name
 
@@ -88,6 +114,13 @@ if __name__ == "__main__":
     parser.add_argument("--depth", type=int, default=3, help="Search depth for the algorithm")
     parser.add_argument("--max-moves", type=int, default=50, help="Maximum number of moves")
     parser.add_argument("--no-display", action="store_true", help="Disable display window")
+    parser.add_argument("--clock", type=float, default=None,
+                       help="Game clock in seconds per side (depth becomes the maximum depth)")
+    parser.add_argument("--increment", type=float, default=0.0, help="Increment in seconds per move")
+    parser.add_argument("--moves-to-go", type=int, default=None,
+                       help="Moves until the clock control (default: sudden death)")
+    parser.add_argument("--weights", type=str, default=None,
+                       help="Tuned evaluation weights file (from scripts/tune_evaluation.py)")
 
     args = parser.parse_args()
 
@@ -95,5 +128,9 @@ if __name__ == "__main__":
         algorithm=args.algorithm,
         depth=args.depth,
         max_moves=args.max_moves,
-        display=not args.no_display
+        display=not args.no_display,
+        clock=args.clock,
+        increment=args.increment,
+        moves_to_go=args.moves_to_go,
+        weights=args.weights
     )
\ No newline at end of file
@@ -9,7 +9,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.chess_env import ChessEnvironment
 from src.minimax import MinimaxAgent
 from src.alphabeta import AlphaBetaAgent
-from src.visualizer import ChessVisualizer
+from src.visualizer import ChessVisualizer, AsyncVisualizer
+from src.evaluation import load_weights
+from src.time_manager import TimeManager
 
 def main():
     """Run a simple chess game with visualization"""
@@ -34,19 +36,43 @@ def main():
     except:
         depth = 3  
 
+    print("\nChoose game clock:")
+    print("With a clock the depth above becomes the maximum search depth")
+    try:
+        clock = float(input("Enter seconds per side (blank for no clock): ").strip())
+        if clock <= 0:
+            clock = None
+    except:
+        clock = None
+
+    try:
+        weights = input("\nTuned weights file (blank for default): ").strip()
+    except:
+        weights = ""
+    if weights:
+        try:
+            load_weights(weights)
+        except Exception as e:
+            print(f"Error loading weights: {e}")
+            print("Using default weights instead")
+
     env = ChessEnvironment()
     board = env.reset()
 
+    white_clock = TimeManager(clock) if clock else None
+    black_clock = TimeManager(clock) if clock else None
+
     if choice == 1:
-        white_agent = MinimaxAgent(depth=depth)
-        black_agent = MinimaxAgent(depth=depth)
+        white_agent = MinimaxAgent(depth=depth, time_manager=white_clock)
+        black_agent = MinimaxAgent(depth=depth, time_manager=black_clock)
         algorithm_name = "Minimax"
     else:
-        white_agent = AlphaBetaAgent(depth=depth)
-        black_agent = AlphaBetaAgent(depth=depth)
+        white_agent = AlphaBetaAgent(depth=depth, time_manager=white_clock)
+        black_agent = AlphaBetaAgent(depth=depth, time_manager=black_clock)
         algorithm_name = "Alpha-Beta"
 
     visualizer = ChessVisualizer()
+    window = AsyncVisualizer()
 
     try:
         record_video = input("\nRecord video? (y/n): ").strip().lower() == 'y'
@@ -57,6 +83,7 @@ def main():
     move_count = 0
     last_move = None
     game_over = False
+    flagged = None
 
     print(f"\nStarting chess game with {algorithm_name} algorithm (depth={depth})")
     print("Press Ctrl+C to stop the game at any time.")
@@ -86,6 +113,12 @@ def main():
                     game_over = True
                     break
 
+            if current_agent.time_manager is not None:
+                print(f"Clock: {current_agent.time_manager.remaining:.2f} seconds left")
+                if current_agent.time_manager.flagged():
+                    flagged = player
+                    break
+
             board, _, game_over, _ = env.step(move)
             last_move = move
             move_count += 1
@@ -96,15 +129,13 @@ def main():
                 except Exception as e:
                     print(f"Error capturing frame: {e}")
 
-            try:
-                if not visualizer.show(board, last_move):
-                    break  
-                time.sleep(0.5)  
-            except Exception as e:
-                print(f"Error displaying board: {e}")
+            if not window.show(board, last_move):
+                print("Display window closed, stopping game")
                 break
 
-        if game_over:
+        if flagged:
+            print(f"\n{flagged} ran out of time!")
+        elif game_over:
             result = board.result()
             print(f"\nGame over! Result: {result}")
             if result == "1-0":
@@ -138,6 +169,7 @@ def main():
 
     finally:
 
+        window.close()
         pygame.quit()
         print("\nThank you for using Chess AI!")
 
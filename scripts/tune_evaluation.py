@@ -0,0 +1,83 @@
+import sys
+import os
+import time
+import random
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.alphabeta import AlphaBetaAgent
+from src.evaluation import load_weights
+from src.tuning import PositionDataset, TexelTuner, extract_game, self_play_game, pgn_games
+
+def extract(dataset_dir, games=0, depth=2, max_moves=200, pgn=None, random_plies=8, seed=None):
+    """Add the quiet positions of self-play games and/or a PGN file to the dataset"""
+
+    dataset = PositionDataset(dataset_dir)
+    rng = random.Random(seed)
+
+    for game_index in range(games):
+        moves, result = self_play_game(AlphaBetaAgent(depth=depth), AlphaBetaAgent(depth=depth), max_moves,
+                                       random_plies=random_plies, rng=rng)
+        features, remainders, results = extract_game(moves, result)
+        dataset.append(features, remainders, results)
+        print(f"Self-play game {game_index + 1}/{games}: {result}, {len(results)} positions")
+
+    if pgn:
+        game_count = 0
+        for moves, result in pgn_games(pgn):
+            features, remainders, results = extract_game(moves, result)
+            dataset.append(features, remainders, results)
+            game_count += 1
+        print(f"Extracted {game_count} games from {pgn}")
+
+    print(f"Dataset {dataset_dir} now holds {len(dataset)} positions")
+
+def tune(dataset_dir, output, epochs=50, learning_rate=1.0, weights=None):
+    """Tune the material and piece-square weights on the dataset and export them"""
+
+    if weights:
+        load_weights(weights)
+
+    features, remainders, results = PositionDataset(dataset_dir).load()
+    tuner = TexelTuner(features, remainders, results)
+
+    start_time = time.time()
+    k = tuner.fit_k()
+    print(f"Fitted K = {k:.4f}, initial loss {tuner.loss():.6f}")
+
+    tuner.tune(epochs=epochs, learning_rate=learning_rate)
+    tuner.save(output)
+
+    print(f"Tuned {len(results)} positions in {time.time() - start_time:.2f} seconds")
+    print(f"Weights saved to {output}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune the evaluation weights from game results")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    extract_parser = subparsers.add_parser("extract", help="Extract quiet positions into a dataset")
+    extract_parser.add_argument("--dataset", type=str, default="data/positions", help="Dataset directory")
+    extract_parser.add_argument("--games", type=int, default=10, help="Number of self-play games to play")
+    extract_parser.add_argument("--depth", type=int, default=2, help="Search depth for self-play")
+    extract_parser.add_argument("--max-moves", type=int, default=200, help="Maximum number of plies per game")
+    extract_parser.add_argument("--pgn", type=str, default=None, help="PGN file of extra games to extract")
+    extract_parser.add_argument("--random-plies", type=int, default=8,
+                                help="Random opening plies so self-play games differ")
+    extract_parser.add_argument("--seed", type=int, default=None, help="Seed for the random openings")
+
+    tune_parser = subparsers.add_parser("tune", help="Fit the weights on a dataset")
+    tune_parser.add_argument("--dataset", type=str, default="data/positions", help="Dataset directory")
+    tune_parser.add_argument("--output", type=str, default="data/weights.npz", help="Output weights file")
+    tune_parser.add_argument("--epochs", type=int, default=50, help="Number of passes over the dataset")
+    tune_parser.add_argument("--learning-rate", type=float, default=1.0, help="Step size in centipawns")
+    tune_parser.add_argument("--weights", type=str, default=None, help="Weights file to start from")
+
+    args = parser.parse_args()
+
+    if args.command == "extract":
+        extract(args.dataset, games=args.games, depth=args.depth, max_moves=args.max_moves, pgn=args.pgn,
+                random_plies=args.random_plies, seed=args.seed)
+    else:
+        tune(args.dataset, args.output, epochs=args.epochs, learning_rate=args.learning_rate,
+             weights=args.weights)
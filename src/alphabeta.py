@@ -1,13 +1,81 @@
 import chess
-from src.evaluation import evaluate_board
+from src.evaluation import evaluate_board, PAWN_HASH
+from src.node_context import NodeContext, root_history, repeated_keys
 import time
 
 class AlphaBetaAgent:
     """Chess agent using the Alpha-Beta pruning algorithm"""
+
+    def __init__(self, depth=3, time_manager=None):
+        self.depth = depth
+        self.nodes_explored = 0
+        self.max_time = 60
+        self.time_manager = time_manager
+        self.history = []
+        self.repeated = set()
+        self.start_time = None
+        self.stopped = False
+
+    def choose_move(self, board):
+        """
+        Choose the best move for the side to move.
+
+        Without a time manager the search runs once at the fixed depth. With
+        one it deepens iteratively up to that depth and lets the time manager
+        decide when to stop.
+        """
+        self.nodes_explored = 0
+        PAWN_HASH.reset_stats()
+        self.start_time = time.time()
+        self.stopped = False
+        self.repeated = repeated_keys(root_history(board))
+        self.history = []
+
+        if self.time_manager is None:
+            best_move, best_value = self.search_root(board, self.depth)
+        else:
+            self.time_manager.start_move()
+            best_move, best_value = None, None
+            for depth in range(1, self.depth + 1):
+                move, value = self.search_root(board, depth, best_move)
+                if self.stopped:
+                    if best_move is None:
+                        best_move, best_value = move, value
+                    break
+                best_move, best_value = move, value
+                self.time_manager.update(move, value if board.turn == chess.WHITE else -value)
+                if self.time_manager.should_stop():
+                    break
+            self.time_manager.end_move()
+
+        end_time = time.time()
+        print(f"Alpha-Beta pruning explored {self.nodes_explored} nodes in {end_time - self.start_time:.2f} seconds")
+        print(f"Pawn hash hit rate: {PAWN_HASH.hit_rate():.1%} of {PAWN_HASH.probes} probes")
+        print(f"Best move: {best_move}, Best value: {best_value}")
+
+        return best_move
+
+    def search_root(self, board, depth, first_move=None):
+        """
+        Search every root move to the given depth
+
+        Args:
+            board: Chess board
+            depth: Search depth
+            first_move: Move to search first, usually the previous iteration's best
+
+        Returns:
+            The best move and its evaluation score
+        """
+        maximizing = board.turn == chess.WHITE
+
+        best_move = None
+        best_value = float('-inf') if maximizing else float('inf')
         alpha = float('-inf')
         beta = float('inf')
 
-        moves = list(board.legal_moves)
+        root = NodeContext(board, self.history, self.repeated)
+        moves = root.legal_moves
 
         ordered_moves = []
         for move in moves:
@@ -15,12 +83,19 @@ class AlphaBetaAgent:
                 ordered_moves.insert(0, move)
             else:
                 ordered_moves.append(move)
+        if first_move in ordered_moves:
+            ordered_moves.remove(first_move)
+            ordered_moves.insert(0, first_move)
 
+        self.history.append(root.key)
         for move in ordered_moves:
             board.push(move)
-            value = self.alpha_beta(board, self.depth - 1, alpha, beta, not maximizing)
+            value = self.alpha_beta(board, depth - 1, alpha, beta, not maximizing)
             board.pop()
 
+            if self.stopped:
+                break
+
             self.nodes_explored += 1
 
             if maximizing and value > best_value:
@@ -32,15 +107,12 @@ class AlphaBetaAgent:
                 best_move = move
                 beta = min(beta, value)
 
-            if time.time() - start_time > self.max_time:
+            if self.time_manager is None and time.time() - self.start_time > self.max_time:
                 print("Time limit reached, stopping search")
                 break
+        self.history.pop()
 
-        end_time = time.time()
-        print(f"Alpha-Beta pruning explored {self.nodes_explored} nodes in {end_time - start_time:.2f} seconds")
-        print(f"Best move: {best_move}, Best value: {best_value}")
-
-        return best_move
+        return best_move, best_value
 
     def alpha_beta(self, board, depth, alpha, beta, maximizing):
         """
@@ -57,14 +129,25 @@ class AlphaBetaAgent:
             The best evaluation score
         """
 
-        if depth == 0 or board.is_game_over():
-            return evaluate_board(board)
+        if self.stopped:
+            return 0
+
+        node = NodeContext(board, self.history, self.repeated)
+        if depth == 0 or node.is_terminal:
+            return evaluate_board(board, node)
+
+        # Leaves are never cut short, so a depth 1 iteration always completes
+        if self.time_manager is not None and self.time_manager.out_of_time():
+            print("Time limit reached, stopping search")
+            self.stopped = True
+            return 0
 
         self.nodes_explored += 1
 
+        self.history.append(node.key)
         if maximizing:
             value = float('-inf')
-            for move in board.legal_moves:
+            for move in node.legal_moves:
                 board.push(move)
                 value = max(value, self.alpha_beta(board, depth - 1, alpha, beta, False))
                 board.pop()
@@ -72,10 +155,9 @@ class AlphaBetaAgent:
                 alpha = max(alpha, value)
                 if alpha >= beta:
                     break  
-            return value
         else:
             value = float('inf')
-            for move in board.legal_moves:
+            for move in node.legal_moves:
                 board.push(move)
                 value = min(value, self.alpha_beta(board, depth - 1, alpha, beta, True))
                 board.pop()
@@ -83,4 +165,5 @@ class AlphaBetaAgent:
                 beta = min(beta, value)
                 if beta <= alpha:
                     break  
-            return value
\ No newline at end of file
+        self.history.pop()
+        return value
\ No newline at end of file
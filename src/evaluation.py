@@ -1,5 +1,7 @@
 import chess
 import numpy as np
+from src.node_context import NodeContext
+from src.pawn_structure import PawnHashTable, pawn_shield
 
 PIECE_VALUES = {
     chess.PAWN: 100,
@@ -96,28 +98,52 @@ PIECE_SQUARE_TABLES = {
     chess.KING: KING_TABLE_MIDDLEGAME  
 }
 
-def evaluate_board(board):
+PAWN_HASH = PawnHashTable()
+
+def load_weights(path):
+    """
+    Replace the material values, piece-square tables and endgame king table
+    with weights exported by the tuner (src/tuning.py).
+    """
+    weights = np.load(path)
+    piece_types = [chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN, chess.KING]
+    for piece_type, value, table in zip(piece_types, weights["piece_values"], weights["tables"]):
+        PIECE_VALUES[piece_type] = int(value)
+        PIECE_SQUARE_TABLES[piece_type] = np.array(table)
+    KING_TABLE_ENDGAME[:] = weights["king_endgame_table"]
+
+def is_endgame_position(board):
+    """Whether the endgame king table applies: no queens left or at most 12 non-king pieces"""
+    piece_count = len(board.pieces(chess.QUEEN, chess.WHITE)) + len(board.pieces(chess.QUEEN, chess.BLACK))
+    total_pieces = len(list(board.pieces(chess.PAWN, chess.WHITE))) + len(list(board.pieces(chess.PAWN, chess.BLACK))) + \
+                   len(list(board.pieces(chess.KNIGHT, chess.WHITE))) + len(list(board.pieces(chess.KNIGHT, chess.BLACK))) + \
+                   len(list(board.pieces(chess.BISHOP, chess.WHITE))) + len(list(board.pieces(chess.BISHOP, chess.BLACK))) + \
+                   len(list(board.pieces(chess.ROOK, chess.WHITE))) + len(list(board.pieces(chess.ROOK, chess.BLACK))) + \
+                   len(list(board.pieces(chess.QUEEN, chess.WHITE))) + len(list(board.pieces(chess.QUEEN, chess.BLACK)))
+
+    return piece_count == 0 or total_pieces <= 12
+
+def evaluate_board(board, node=None):
     """
     Evaluate the current board position.
     Positive score means advantage for white, negative for black.
+
+    A NodeContext already built by the search can be passed as node so its
+    legal moves and terminal flags are reused instead of regenerated.
     """
-    if board.is_checkmate():
+    if node is None:
+        node = NodeContext(board)
+
+    if node.is_checkmate:
 
         return -10000 if board.turn else 10000
 
-    if board.is_stalemate() or board.is_insufficient_material() or board.can_claim_fifty_moves() or board.is_repetition():
+    if node.is_draw:
         return 0  
 
     score = 0
 
-    piece_count = len(board.pieces(chess.QUEEN, chess.WHITE)) + len(board.pieces(chess.QUEEN, chess.BLACK))
-    total_pieces = len(list(board.pieces(chess.PAWN, chess.WHITE))) + len(list(board.pieces(chess.PAWN, chess.BLACK))) + \
-                   len(list(board.pieces(chess.KNIGHT, chess.WHITE))) + len(list(board.pieces(chess.KNIGHT, chess.BLACK))) + \
-                   len(list(board.pieces(chess.BISHOP, chess.WHITE))) + len(list(board.pieces(chess.BISHOP, chess.BLACK))) + \
-                   len(list(board.pieces(chess.ROOK, chess.WHITE))) + len(list(board.pieces(chess.ROOK, chess.BLACK))) + \
-                   len(list(board.pieces(chess.QUEEN, chess.WHITE))) + len(list(board.pieces(chess.QUEEN, chess.BLACK)))
-
-    is_endgame = piece_count == 0 or total_pieces <= 12
+    is_endgame = is_endgame_position(board)
 
     for square in chess.SQUARES:
         piece = board.piece_at(square)
@@ -145,8 +171,7 @@ def evaluate_board(board):
 
             score += value + square_value
 
-    legal_moves = list(board.legal_moves)
-    move_count = len(legal_moves)
+    move_count = len(node.legal_moves)
 
     board.turn = not board.turn
     opponent_moves = len(list(board.legal_moves))
@@ -158,21 +183,9 @@ def evaluate_board(board):
 
     score += mobility_score
 
-    for file in range(8):
-        white_pawns = 0
-        black_pawns = 0
-        for rank in range(8):
-            square = rank * 8 + file
-            piece = board.piece_at(square)
-            if piece is not None and piece.piece_type == chess.PAWN:
-                if piece.color:  
-                    white_pawns += 1
-                else:  
-                    black_pawns += 1
-
-        if white_pawns > 1:
-            score -= (white_pawns - 1) * 20
-        if black_pawns > 1:
-            score += (black_pawns - 1) * 20
+    score += PAWN_HASH.probe(board.pieces_mask(chess.PAWN, chess.WHITE),
+                             board.pieces_mask(chess.PAWN, chess.BLACK))
+    if not is_endgame:
+        score += pawn_shield(board)
 
     return score
\ No newline at end of file
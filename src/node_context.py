@@ -0,0 +1,71 @@
+import chess
+
+
+def position_key(board):
+    """Hashable key identifying a position for repetition detection"""
+    return (board.pawns, board.knights, board.bishops, board.rooks,
+            board.queens, board.kings,
+            board.occupied_co[chess.WHITE], board.occupied_co[chess.BLACK],
+            board.turn, board.clean_castling_rights(),
+            board.ep_square if board.has_legal_en_passant() else None)
+
+
+def root_history(board):
+    """
+    Build the key history of the positions that precede the current one.
+
+    Only positions since the last irreversible move are collected, since
+    nothing older can ever repeat.
+    """
+    history = []
+    replay = board.copy()
+    for _ in range(min(board.halfmove_clock, len(board.move_stack))):
+        replay.pop()
+        history.append(position_key(replay))
+    history.reverse()
+    return history
+
+
+def repeated_keys(history):
+    """Set of the keys that occur at least twice in a key history"""
+    seen = set()
+    repeated = set()
+    for key in history:
+        if key in seen:
+            repeated.add(key)
+        seen.add(key)
+    return repeated
+
+
+class NodeContext:
+    """
+    Per-node search information computed once and shared by terminal
+    detection, evaluation and child expansion.
+
+    The legal moves are generated a single time; checkmate and stalemate
+    are derived from them. When a key history of the search path is given,
+    repetition is detected by looking the current key up in it instead of
+    replaying the move stack. A single repeat within the search path scores
+    as a draw, while a position from the game before the search root must
+    already have occurred twice, matching the threefold rule; those keys are
+    passed in as the repeated set built by repeated_keys.
+    """
+
+    def __init__(self, board, history=None, repeated=frozenset()):
+        self.legal_moves = list(board.legal_moves)
+        self.in_check = board.is_check()
+        self.is_checkmate = not self.legal_moves and self.in_check
+        self.is_stalemate = not self.legal_moves and not self.in_check
+
+        if history is None:
+            self.key = None
+            self.is_repetition = board.is_repetition()
+        else:
+            self.key = position_key(board)
+            self.is_repetition = self.key in history or self.key in repeated
+
+        self.is_draw = (self.is_stalemate
+                        or self.is_repetition
+                        or board.halfmove_clock >= 100
+                        or board.is_insufficient_material())
+        self.is_terminal = self.is_checkmate or self.is_draw
@@ -0,0 +1,142 @@
+import chess
+
+DOUBLED_PAWN_PENALTY = 20
+ISOLATED_PAWN_PENALTY = 15
+BACKWARD_PAWN_PENALTY = 10
+PASSED_PAWN_BONUS = [0, 10, 15, 25, 40, 60, 90, 0]
+PAWN_SHIELD_BONUS = 10
+
+
+def _adjacent_files(file):
+    mask = 0
+    if file > 0:
+        mask |= chess.BB_FILES[file - 1]
+    if file < 7:
+        mask |= chess.BB_FILES[file + 1]
+    return mask
+
+
+def _ranks_ahead(color, rank):
+    """Mask of all ranks strictly in front of rank from color's side"""
+    mask = 0
+    ranks = range(rank + 1, 8) if color == chess.WHITE else range(rank)
+    for r in ranks:
+        mask |= chess.BB_RANKS[r]
+    return mask
+
+
+ADJACENT_FILES = [_adjacent_files(f) for f in range(8)]
+
+# Enemy pawns on any of these squares stop the pawn from being passed
+PASSED_MASKS = [[0] * 64, [0] * 64]
+# Friendly pawns on any of these squares can still advance to support the pawn
+SUPPORT_MASKS = [[0] * 64, [0] * 64]
+# Squares directly in front of a king that its own pawns should cover
+SHIELD_MASKS = [[0] * 64, [0] * 64]
+
+for _color in chess.COLORS:
+    for _square in chess.SQUARES:
+        _file = chess.square_file(_square)
+        _rank = chess.square_rank(_square)
+        _ahead = _ranks_ahead(_color, _rank)
+        _files = chess.BB_FILES[_file] | ADJACENT_FILES[_file]
+        PASSED_MASKS[_color][_square] = _files & _ahead
+        SUPPORT_MASKS[_color][_square] = ADJACENT_FILES[_file] & ~_ahead & chess.BB_ALL
+
+        _step = 1 if _color == chess.WHITE else -1
+        _shield_ranks = 0
+        for _r in (_rank + _step, _rank + 2 * _step):
+            if 0 <= _r < 8:
+                _shield_ranks |= chess.BB_RANKS[_r]
+        SHIELD_MASKS[_color][_square] = _files & _shield_ranks
+
+
+def _side_pawn_score(color, own, enemy):
+    """Score the pawn structure of one side, positive is good for that side"""
+    score = 0
+
+    for file in range(8):
+        count = chess.popcount(own & chess.BB_FILES[file])
+        if count > 1:
+            score -= (count - 1) * DOUBLED_PAWN_PENALTY
+
+    forward = 8 if color == chess.WHITE else -8
+    for square in chess.scan_forward(own):
+        file = chess.square_file(square)
+
+        if not own & ADJACENT_FILES[file]:
+            score -= ISOLATED_PAWN_PENALTY
+        elif not own & SUPPORT_MASKS[color][square]:
+            stop = square + forward
+            if 0 <= stop < 64 and chess.BB_PAWN_ATTACKS[color][stop] & enemy:
+                score -= BACKWARD_PAWN_PENALTY
+
+        if not enemy & PASSED_MASKS[color][square]:
+            score += PASSED_PAWN_BONUS[chess.square_rank(square) if color == chess.WHITE
+                                       else 7 - chess.square_rank(square)]
+
+    return score
+
+
+def evaluate_pawn_structure(white_pawns, black_pawns):
+    """
+    Evaluate doubled, isolated, backward and passed pawns from the two pawn bitboards.
+    Positive score means advantage for white, negative for black.
+    """
+    return (_side_pawn_score(chess.WHITE, white_pawns, black_pawns)
+            - _side_pawn_score(chess.BLACK, black_pawns, white_pawns))
+
+
+def pawn_shield(board):
+    """
+    Reward pawns covering each king from the two ranks in front of it.
+
+    This depends on the king squares as well as the pawns, so it is not
+    stored in the pawn hash; it only costs one mask lookup per side.
+    """
+    score = 0
+    for color in chess.COLORS:
+        king = board.king(color)
+        if king is None:
+            continue
+        shield = chess.popcount(board.pieces_mask(chess.PAWN, color) & SHIELD_MASKS[color][king])
+        score += shield * PAWN_SHIELD_BONUS if color == chess.WHITE else -shield * PAWN_SHIELD_BONUS
+    return score
+
+
+class PawnHashTable:
+    """Fixed-size cache of pawn structure scores keyed by the two pawn bitboards"""
+
+    def __init__(self, size=16384):
+        self.size = size
+        self.entries = [None] * size
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, white_pawns, black_pawns):
+        """Return the pawn structure score, computing and storing it on a miss"""
+        self.probes += 1
+        index = hash((white_pawns, black_pawns)) % self.size
+        entry = self.entries[index]
+        if entry is not None and entry[0] == white_pawns and entry[1] == black_pawns:
+            self.hits += 1
+            return entry[2]
+
+        score = evaluate_pawn_structure(white_pawns, black_pawns)
+        self.entries[index] = (white_pawns, black_pawns, score)
+        return score
+
+    def hit_rate(self):
+        """Fraction of probes answered from the table"""
+        return self.hits / self.probes if self.probes else 0.0
+
+    def reset_stats(self):
+        """Reset the statistics but keep the entries"""
+        self.probes = 0
+        self.hits = 0
+
+    def clear(self):
+        """Drop all entries and reset the statistics"""
+        self.entries = [None] * self.size
+        self.probes = 0
+        self.hits = 0
@@ -0,0 +1,109 @@
+import time
+
+DEFAULT_MOVES_TO_GO = 30
+INCREMENT_USAGE = 0.8
+HARD_LIMIT_FACTOR = 4.0
+NEXT_ITERATION_FRACTION = 0.6
+SCORE_DROP_MARGIN = 50
+UNSTABLE_SCALE = 1.5
+SCORE_DROP_SCALE = 2.0
+STABLE_SCALE = 0.5
+STABLE_ITERATIONS = 2
+
+
+class TimeManager:
+    """
+    Game clock for one side that allocates a soft and a hard time limit per move.
+
+    With moves_to_go the clock is a repeating control: total_time is added
+    again every moves_to_go moves. Without it the game is sudden death.
+
+    The soft limit is the normal budget: it is checked between iterations
+    and scaled up when the best move changes or the score drops, and down
+    when the best move has been stable for several iterations. The hard
+    limit is never exceeded and aborts a running iteration.
+    """
+
+    def __init__(self, total_time, increment=0.0, moves_to_go=None, move_overhead=0.05):
+        self.remaining = total_time
+        self.increment = increment
+        self.moves_to_go = moves_to_go
+        self.period_time = total_time
+        self.period_moves = moves_to_go
+        self.move_overhead = move_overhead
+        self.soft_limit = 0.0
+        self.hard_limit = 0.0
+        self.start_time = None
+        self.best_move = None
+        self.best_score = None
+        self.stable_iterations = 0
+        self.scale = 1.0
+
+    def start_move(self):
+        """Start the clock for a new move and compute its time limits"""
+        self.start_time = time.time()
+        self.best_move = None
+        self.best_score = None
+        self.stable_iterations = 0
+        self.scale = 1.0
+
+        moves_left = self.moves_to_go if self.moves_to_go else DEFAULT_MOVES_TO_GO
+        available = max(self.remaining - self.move_overhead, 0.0)
+
+        self.hard_limit = min(available / min(moves_left, HARD_LIMIT_FACTOR),
+                              (available / moves_left + self.increment) * HARD_LIMIT_FACTOR)
+        self.soft_limit = min(available / moves_left + self.increment * INCREMENT_USAGE,
+                              self.hard_limit)
+
+    def elapsed(self):
+        """Seconds spent on the current move"""
+        return time.time() - self.start_time
+
+    def out_of_time(self):
+        """Whether the hard limit has been reached and the search must stop"""
+        return self.elapsed() >= self.hard_limit
+
+    def update(self, best_move, score):
+        """
+        Record the result of a completed iteration.
+
+        Args:
+            best_move: Best move found by the iteration
+            score: Its score from the point of view of the side to move
+        """
+        self.scale = 1.0
+        if self.best_move is not None:
+            if best_move == self.best_move:
+                self.stable_iterations += 1
+            else:
+                self.stable_iterations = 0
+                self.scale = UNSTABLE_SCALE
+
+            if score < self.best_score - SCORE_DROP_MARGIN:
+                self.scale = max(self.scale, SCORE_DROP_SCALE)
+            elif self.stable_iterations >= STABLE_ITERATIONS:
+                self.scale = STABLE_SCALE
+
+        self.best_move = best_move
+        self.best_score = score
+
+    def should_stop(self):
+        """Whether to return the current best move instead of starting another iteration"""
+        budget = min(self.soft_limit * self.scale, self.hard_limit)
+        return self.elapsed() >= budget * NEXT_ITERATION_FRACTION
+
+    def end_move(self):
+        """
+        Stop the clock, charge the time used and add the increment. When the
+        move control is reached the next period's time is added.
+        """
+        self.remaining += self.increment - self.elapsed()
+        if self.moves_to_go:
+            self.moves_to_go -= 1
+            if self.moves_to_go == 0:
+                self.remaining += self.period_time
+                self.moves_to_go = self.period_moves
+
+    def flagged(self):
+        """Whether this side has run out of time"""
+        return self.remaining <= 0
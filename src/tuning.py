@@ -0,0 +1,283 @@
+import os
+import random
+import chess
+import chess.pgn
+import numpy as np
+
+from src.evaluation import (PIECE_VALUES, PIECE_SQUARE_TABLES, KING_TABLE_ENDGAME,
+                            evaluate_board, is_endgame_position)
+from src.node_context import NodeContext
+
+PIECE_TYPES = [chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN, chess.KING]
+# The king gets a second block of features for positions that use the endgame king table
+ENDGAME_KING_BLOCK = len(PIECE_TYPES)
+NUM_FEATURES = (len(PIECE_TYPES) + 1) * 64
+
+RESULTS = {"1-0": 1.0, "0-1": 0.0, "1/2-1/2": 0.5}
+
+
+def extract_features(board):
+    """
+    Encode a position as per-piece-square indicator features.
+
+    Feature piece_index * 64 + table_index is +1 for a white piece and -1 for
+    a black piece, using the same table indexing as evaluate_board, so the
+    dot product with the flattened material + piece-square tables gives the
+    material and placement part of the evaluation. In endgame positions the
+    kings use the endgame king block, as evaluate_board switches tables.
+    """
+    features = np.zeros(NUM_FEATURES, dtype=np.int8)
+    endgame = is_endgame_position(board)
+    for piece_index, piece_type in enumerate(PIECE_TYPES):
+        if piece_type == chess.KING and endgame:
+            piece_index = ENDGAME_KING_BLOCK
+        offset = piece_index * 64
+        for square in chess.scan_forward(board.pieces_mask(piece_type, chess.WHITE)):
+            table_idx = (7 - chess.square_rank(square)) * 8 + chess.square_file(square)
+            features[offset + table_idx] += 1
+        for square in chess.scan_forward(board.pieces_mask(piece_type, chess.BLACK)):
+            table_idx = 63 - ((7 - chess.square_rank(square)) * 8 + chess.square_file(square))
+            features[offset + table_idx] -= 1
+    return features
+
+
+def is_quiet(board, move):
+    """Whether the position before move is quiet enough to label with the game result"""
+    return not board.is_check() and not board.is_capture(move) and move.promotion is None
+
+
+def extract_game(moves, result, skip_opening=8):
+    """
+    Collect the features of the quiet positions of one game.
+
+    Besides the features, each position stores its remainder: the part of
+    evaluate_board that the tuned weights do not cover (pawn structure,
+    pawn shield and mobility). The tuner adds it back so the weights are fit
+    to the full evaluation that will load them.
+
+    Args:
+        moves: Moves of the game from the starting position
+        result: Result string of the game
+        skip_opening: Number of plies to skip at the start of the game
+
+    Returns:
+        The feature rows, the evaluation remainders and the result of the
+        game from white's point of view
+    """
+    if result not in RESULTS:
+        return (np.zeros((0, NUM_FEATURES), dtype=np.int8), np.zeros(0, dtype=np.float32),
+                np.zeros(0, dtype=np.float32))
+
+    weights = initial_weights()
+    board = chess.Board()
+    rows = []
+    remainders = []
+    for ply, move in enumerate(moves):
+        if ply >= skip_opening and is_quiet(board, move):
+            node = NodeContext(board)
+            if not node.is_terminal:
+                features = extract_features(board)
+                rows.append(features)
+                remainders.append(evaluate_board(board, node) - features @ weights)
+        board.push(move)
+
+    features = np.array(rows, dtype=np.int8).reshape(-1, NUM_FEATURES)
+    remainders = np.array(remainders, dtype=np.float32)
+    results = np.full(len(rows), RESULTS[result], dtype=np.float32)
+    return features, remainders, results
+
+
+def self_play_game(white_agent, black_agent, max_moves=200, random_plies=8, rng=None):
+    """
+    Play a game between two agents and return its moves and result.
+
+    The agents are deterministic, so the first random_plies plies are random
+    legal moves to make every game different. These plies fall inside the
+    opening that extract_game skips by default.
+    """
+    rng = random.Random() if rng is None else rng
+    board = chess.Board()
+    while len(board.move_stack) < random_plies and not board.is_game_over():
+        board.push(rng.choice(list(board.legal_moves)))
+    while not board.is_game_over(claim_draw=True) and len(board.move_stack) < max_moves:
+        agent = white_agent if board.turn == chess.WHITE else black_agent
+        move = agent.choose_move(board)
+        if move is None:
+            break
+        board.push(move)
+    return list(board.move_stack), board.result(claim_draw=True)
+
+
+def pgn_games(path):
+    """Yield the moves and result of every game in a PGN file"""
+    with open(path) as pgn:
+        while True:
+            game = chess.pgn.read_game(pgn)
+            if game is None:
+                break
+            yield list(game.mainline_moves()), game.headers.get("Result", "*")
+
+
+class PositionDataset:
+    """
+    On-disk dataset of position features, evaluation remainders and game results.
+
+    Rows are appended to raw int8 and float32 files and read back as
+    memory-mapped arrays, so datasets larger than memory can be tuned on.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.features_path = os.path.join(directory, "features.bin")
+        self.remainders_path = os.path.join(directory, "remainders.bin")
+        self.results_path = os.path.join(directory, "results.bin")
+        os.makedirs(directory, exist_ok=True)
+
+    def append(self, features, remainders, results):
+        """Append feature rows, their evaluation remainders and their results to the dataset"""
+        with open(self.features_path, "ab") as f:
+            f.write(np.ascontiguousarray(features, dtype=np.int8).tobytes())
+        with open(self.remainders_path, "ab") as f:
+            f.write(np.ascontiguousarray(remainders, dtype=np.float32).tobytes())
+        with open(self.results_path, "ab") as f:
+            f.write(np.ascontiguousarray(results, dtype=np.float32).tobytes())
+
+    def __len__(self):
+        if not os.path.exists(self.results_path):
+            return 0
+        return os.path.getsize(self.results_path) // np.dtype(np.float32).itemsize
+
+    def load(self):
+        """Return memory-mapped features, remainders and results arrays"""
+        count = len(self)
+        if count == 0:
+            raise ValueError(f"No positions in dataset {self.directory}")
+        if not os.path.exists(self.remainders_path):
+            raise ValueError(f"Dataset {self.directory} has no evaluation remainders, extract it again")
+        features = np.memmap(self.features_path, dtype=np.int8, mode="r", shape=(count, NUM_FEATURES))
+        remainders = np.memmap(self.remainders_path, dtype=np.float32, mode="r", shape=(count,))
+        results = np.memmap(self.results_path, dtype=np.float32, mode="r", shape=(count,))
+        return features, remainders, results
+
+
+def initial_weights():
+    """Flatten the current material values and piece-square tables into a weight vector"""
+    tables = [PIECE_SQUARE_TABLES[piece_type] + PIECE_VALUES[piece_type] for piece_type in PIECE_TYPES]
+    tables.append(KING_TABLE_ENDGAME + PIECE_VALUES[chess.KING])
+    return np.concatenate(tables).astype(np.float64)
+
+
+def _win_probability(scores, k):
+    return 1.0 / (1.0 + np.power(10.0, np.clip(-k * scores / 400.0, -30.0, 30.0)))
+
+
+class TexelTuner:
+    """
+    Fit the material + piece-square weights to game results.
+
+    Each position is scored as its features times the weights plus its fixed
+    evaluation remainder, which is exactly evaluate_board once the weights
+    are loaded. The evaluation is mapped to an expected score with a logistic curve and
+    the mean squared error against the results is minimised with
+    mini-batch Adam. Each step is a pair of matrix products over
+    a batch, with no per-position Python code.
+    """
+
+    def __init__(self, features, remainders, results, weights=None, batch_size=16384):
+        self.features = features
+        self.remainders = remainders
+        self.results = results
+        self.weights = initial_weights() if weights is None else np.array(weights, dtype=np.float64)
+        self.batch_size = batch_size
+        self.k = 1.0
+
+    def _batches(self, rng=None):
+        count = len(self.results)
+        starts = np.arange(0, count, self.batch_size)
+        if rng is not None:
+            rng.shuffle(starts)
+        for start in starts:
+            end = min(start + self.batch_size, count)
+            yield (np.asarray(self.features[start:end], dtype=np.float32),
+                   np.asarray(self.remainders[start:end], dtype=np.float32),
+                   np.asarray(self.results[start:end], dtype=np.float32))
+
+    def scores(self):
+        """Evaluation of every position under the current weights"""
+        weights = self.weights.astype(np.float32)
+        return np.concatenate([x @ weights + b for x, b, _ in self._batches()])
+
+    def loss(self, k=None):
+        """Mean squared error of the current weights over the whole dataset"""
+        k = self.k if k is None else k
+        total = 0.0
+        for x, b, r in self._batches():
+            total += np.sum((r - _win_probability(x @ self.weights.astype(np.float32) + b, k)) ** 2)
+        return total / len(self.results)
+
+    def fit_k(self, low=0.1, high=3.0, iterations=30):
+        """Choose the logistic scaling constant that best fits the untuned weights"""
+        scores = self.scores()
+        results = np.asarray(self.results, dtype=np.float32)
+
+        def loss(k):
+            return np.mean((results - _win_probability(scores, k)) ** 2)
+
+        ratio = (np.sqrt(5.0) - 1.0) / 2.0
+        a, b = low, high
+        for _ in range(iterations):
+            c = b - ratio * (b - a)
+            d = a + ratio * (b - a)
+            if loss(c) < loss(d):
+                b = d
+            else:
+                a = c
+        self.k = (a + b) / 2.0
+        return self.k
+
+    def tune(self, epochs=50, learning_rate=1.0, seed=0, verbose=True):
+        """
+        Run Adam gradient descent over the dataset.
+
+        Args:
+            epochs: Number of passes over the dataset
+            learning_rate: Step size in centipawns
+            seed: Seed for the batch order
+            verbose: Whether to print the loss after each epoch
+
+        Returns:
+            The tuned weight vector
+        """
+        rng = np.random.default_rng(seed)
+        scale = self.k * np.log(10.0) / 400.0
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        m = np.zeros_like(self.weights)
+        v = np.zeros_like(self.weights)
+        step = 0
+        for epoch in range(epochs):
+            for x, b, r in self._batches(rng):
+                p = _win_probability(x @ self.weights.astype(np.float32) + b, self.k)
+                error = ((r - p) * p * (1.0 - p) * scale).astype(np.float32)
+                gradient = -2.0 * (x.T @ error).astype(np.float64) / len(r)
+
+                step += 1
+                m = beta1 * m + (1.0 - beta1) * gradient
+                v = beta2 * v + (1.0 - beta2) * gradient ** 2
+                m_hat = m / (1.0 - beta1 ** step)
+                v_hat = v / (1.0 - beta2 ** step)
+                self.weights -= learning_rate * m_hat / (np.sqrt(v_hat) + eps)
+            if verbose:
+                print(f"Epoch {epoch + 1}/{epochs}, loss {self.loss():.6f}")
+        return self.weights
+
+    def save(self, path):
+        """Export the tuned weights in the format read by evaluation.load_weights"""
+        tables = self.weights.reshape(len(PIECE_TYPES) + 1, 64)
+        piece_values = np.array([PIECE_VALUES[piece_type] for piece_type in PIECE_TYPES], dtype=np.float64)
+        # Both kings are always on the board, so the king value cancels out and is kept as is
+        piece_values[:-1] = np.round(tables[:len(PIECE_TYPES) - 1].mean(axis=1))
+        np.savez(path,
+                 piece_values=piece_values.astype(np.int64),
+                 tables=np.round(tables[:len(PIECE_TYPES)] - piece_values[:, None]).astype(np.int64),
+                 king_endgame_table=np.round(tables[ENDGAME_KING_BLOCK]
+                                             - PIECE_VALUES[chess.KING]).astype(np.int64))
@@ -2,6 +2,9 @@ import pygame
 import chess
 import time
 import os
+import queue
+from collections import deque
+import multiprocessing
 import cv2
 import numpy as np
 from datetime import datetime
@@ -137,3 +140,91 @@ class ChessVisualizer:
                 cv2.imwrite(frame_path, frame_bgr)
             print(f"Frames saved to {frames_dir}")
         self.frames = []
+
+
+def _display_loop(states, closed, width, height, frame_delay, max_backlog):
+    """
+    Run the display window until told to stop or the window is closed.
+
+    Queued states are shown in order, each for frame_delay seconds. If more
+    than max_backlog states are waiting the oldest are skipped. The stop
+    signal lets the remaining states play out, holding the last one for
+    frame_delay, before the window closes.
+    """
+    visualizer = ChessVisualizer(width, height)
+    board = chess.Board()
+    last_move = None
+    last_shown = 0.0
+    backlog = deque(maxlen=max_backlog)
+    stopping = False
+    dirty = True
+    clock = pygame.time.Clock()
+    while True:
+        while True:
+            try:
+                state = states.get_nowait()
+            except queue.Empty:
+                break
+            if state is None:
+                stopping = True
+            else:
+                backlog.append(state)
+        if time.time() - last_shown >= frame_delay:
+            if backlog:
+                fen, move_uci = backlog.popleft()
+                board = chess.Board(fen)
+                last_move = chess.Move.from_uci(move_uci) if move_uci else None
+                last_shown = time.time()
+                dirty = True
+            elif stopping:
+                break
+        if dirty:
+            if not visualizer.show(board, last_move):
+                closed.set()
+                return
+            dirty = False
+        else:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    closed.set()
+                    pygame.quit()
+                    return
+        clock.tick(30)
+    pygame.quit()
+
+
+class AsyncVisualizer:
+    """
+    Display window running in its own process.
+
+    Board states are sent through a queue, so show() never blocks the
+    caller on rendering. The window process handles its own events and
+    shows every state for frame_delay seconds, skipping the oldest only
+    when more than max_backlog are waiting.
+    """
+
+    def __init__(self, width=600, height=600, frame_delay=0.5, max_backlog=20):
+        context = multiprocessing.get_context("spawn")
+        self.states = context.Queue()
+        self.closed = context.Event()
+        self.process = context.Process(target=_display_loop,
+                                       args=(self.states, self.closed, width, height, frame_delay, max_backlog),
+                                       daemon=True)
+        self.process.start()
+
+    def show(self, board, last_move=None):
+        """Queue a board state for display, returns False once the window has been closed"""
+        if not self.is_open():
+            return False
+        self.states.put((board.fen(), last_move.uci() if last_move else None))
+        return True
+
+    def is_open(self):
+        """Whether the display window is still open"""
+        return not self.closed.is_set() and self.process.is_alive()
+
+    def close(self):
+        """Wait for the display process to show every queued state, then stop it"""
+        if self.process.is_alive():
+            self.states.put(None)
+        self.process.join()